@@ -38,9 +38,12 @@ from few.utils.baseclasses import (
     ParallelModuleBase,
 )
 from few.utils.citations import *
-from few.utils.utility import get_fundamental_frequencies
+from few.utils.utility import get_schwarzschild_frequencies
 from few.utils.constants import *
-from few.summation.interpolatedmodesum import CubicSplineInterpolant
+from few.summation.interpolatedmodesum import (
+    CubicSplineInterpolant,
+    _fill_complex_modes,
+)
 
 # Attempt Cython imports of GPU functions
 try:
@@ -244,28 +247,20 @@ class FDInterpolatedModeSum(SummationBase, SchwarzschildEccentric, ParallelModul
         ninterps = (2 * self.ndim) + 2 * num_teuk_modes  # 2 for re and im
         y_all = xp.zeros((ninterps, length))
 
-        # fill interpolant information in y
-        # all interpolants
-        y_all[:num_teuk_modes] = teuk_modes.T.real
-        y_all[num_teuk_modes : 2 * num_teuk_modes] = teuk_modes.T.imag
+        _fill_complex_modes(y_all, teuk_modes)
 
         y_all[-2] = Phi_phi
         y_all[-1] = Phi_r
 
-        try:
-            p, e = p.get(), e.get()
-        except AttributeError:
-            pass
-
         # get fundamental frequencies across trajectory
-        Omega_phi, Omega_theta, Omega_r = get_fundamental_frequencies(
-            0.0, p, e, np.zeros_like(e)
+        Omega_phi, Omega_theta, Omega_r = get_schwarzschild_frequencies(
+            p, e, use_gpu=self.use_gpu
         )
 
         # convert from dimensionless frequencies
         f_phi, f_r = (
-            xp.asarray(Omega_phi / (2 * np.pi * M * MTSUN_SI)),
-            xp.asarray(Omega_r / (2 * np.pi * M * MTSUN_SI)),
+            Omega_phi / (2 * np.pi * M * MTSUN_SI),
+            Omega_r / (2 * np.pi * M * MTSUN_SI),
         )
 
         # add them for splines
@@ -473,13 +468,8 @@ class FDInterpolatedModeSum(SummationBase, SchwarzschildEccentric, ParallelModul
         k_arr = xp.zeros_like(m_arr)
         data_length = len(self.frequency)
 
-        # prepare spline for GPU evaluation
-        spline_in = (
-            spline.interp_array.reshape(spline.reshape_shape)
-            .transpose((0, 2, 1))
-            .flatten()
-            .copy()
-        )
+        # the kernel reads the coefficients in (4, ninterps, length) order
+        spline_in = spline.coefficients
 
         # where is the zero index
         # for +/- m type of thing
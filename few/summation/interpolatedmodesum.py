@@ -22,10 +22,20 @@ import numpy as np
 # try to import cupy
 try:
     import cupy as cp
+    import cupyx
 
 except (ImportError, ModuleNotFoundError) as e:
     import numpy as np
 
+# numba is optional; it accelerates the CPU spline evaluation
+try:
+    from numba import njit, prange
+
+    numba_available = True
+
+except (ImportError, ModuleNotFoundError) as e:
+    numba_available = False
+
 # Cython imports
 from pyinterp_cpu import interpolate_arrays_wrap as interpolate_arrays_wrap_cpu
 from pyinterp_cpu import get_waveform_wrap as get_waveform_wrap_cpu
@@ -48,6 +58,164 @@ except (ImportError, ModuleNotFoundError) as e:
     pass
 
 
+if numba_available:
+
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _eval_spline(t_grid, y, c1, c2, c3, tnew, deriv_order, out):
+        """Fused segment search and spline evaluation on the CPU.
+
+        Each output point reads its four coefficients exactly once and
+        evaluates the polynomial (or its derivative) with Horner's rule.
+        Points outside the spline domain are filled with edge values.
+
+        """
+        ninterps, length = t_grid.shape
+        num_new = tnew.shape[1]
+
+        for i in prange(ninterps):
+            t_start = t_grid[i, 0]
+            t_end = t_grid[i, length - 1]
+            for k in range(num_new):
+                t_k = tnew[i, k]
+
+                # fill values outside the edges
+                if t_k < t_start:
+                    out[i, k] = y[i, 0]
+                    continue
+
+                elif t_k > t_end:
+                    out[i, k] = y[i, length - 1]
+                    continue
+
+                # equivalent to searchsorted(side="right") - 1
+                lo = 0
+                hi = length
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    if t_grid[i, mid] <= t_k:
+                        lo = mid + 1
+                    else:
+                        hi = mid
+
+                # fix end value
+                ind = min(lo - 1, length - 2)
+
+                x = t_k - t_grid[i, ind]
+                if deriv_order == 0:
+                    out[i, k] = (
+                        (c3[i, ind] * x + c2[i, ind]) * x + c1[i, ind]
+                    ) * x + y[i, ind]
+                elif deriv_order == 1:
+                    out[i, k] = (3.0 * c3[i, ind] * x + 2.0 * c2[i, ind]) * x + c1[
+                        i, ind
+                    ]
+                elif deriv_order == 2:
+                    out[i, k] = 6.0 * c3[i, ind] * x + 2.0 * c2[i, ind]
+                else:
+                    out[i, k] = 6.0 * c3[i, ind]
+
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _fit_spline(t_grid, y, c1, c2, c3):
+        """Not-a-knot cubic spline fit on the CPU.
+
+        Mirrors :code:`interpolate_arrays`, but solves each tridiagonal system
+        with the Thomas algorithm. The forward sweep is stored in :code:`c3`
+        and :code:`c2` and the solved derivatives in :code:`c1`, so no banded
+        matrix scratch arrays are needed.
+
+        """
+        ninterps, length = t_grid.shape
+
+        for i in prange(ninterps):
+            x = t_grid[i]
+            y_i = y[i]
+            dydx = c1[i]
+            c_prime = c3[i]
+            d_prime = c2[i]
+
+            # forward sweep
+            for j in range(length):
+                if j == 0:
+                    dx1 = x[1] - x[0]
+                    dx2 = x[2] - x[1]
+                    d = x[2] - x[0]
+                    slope1 = (y_i[1] - y_i[0]) / dx1
+                    slope2 = (y_i[2] - y_i[1]) / dx2
+
+                    b = ((dx1 + 2 * d) * dx2 * slope1 + dx1 * dx1 * slope2) / d
+                    diag = dx2
+                    ud = d
+                    ld = 0.0
+
+                elif j == length - 1:
+                    dx1 = x[length - 2] - x[length - 3]
+                    dx2 = x[length - 1] - x[length - 2]
+                    d = x[length - 1] - x[length - 3]
+                    slope1 = (y_i[length - 2] - y_i[length - 3]) / dx1
+                    slope2 = (y_i[length - 1] - y_i[length - 2]) / dx2
+
+                    b = (dx2 * dx2 * slope1 + (2 * d + dx2) * dx1 * slope2) / d
+                    diag = dx1
+                    ud = 0.0
+                    ld = d
+
+                else:
+                    dx1 = x[j] - x[j - 1]
+                    dx2 = x[j + 1] - x[j]
+                    slope1 = (y_i[j] - y_i[j - 1]) / dx1
+                    slope2 = (y_i[j + 1] - y_i[j]) / dx2
+
+                    b = 3.0 * (dx2 * slope1 + dx1 * slope2)
+                    diag = 2 * (dx1 + dx2)
+                    ud = dx1
+                    ld = dx2
+
+                if j == 0:
+                    c_prime[j] = ud / diag
+                    d_prime[j] = b / diag
+                else:
+                    denom = diag - ld * c_prime[j - 1]
+                    c_prime[j] = ud / denom
+                    d_prime[j] = (b - ld * d_prime[j - 1]) / denom
+
+            # back substitution
+            dydx[length - 1] = d_prime[length - 1]
+            for j in range(length - 2, -1, -1):
+                dydx[j] = d_prime[j] - c_prime[j] * dydx[j + 1]
+
+            # spline constants, same as fill_coefficients
+            for j in range(length - 1):
+                dx = x[j + 1] - x[j]
+                slope = (y_i[j + 1] - y_i[j]) / dx
+                t = (dydx[j] + dydx[j + 1] - 2 * slope) / dx
+
+                c2[i, j] = (slope - dydx[j]) / dx - t
+                c3[i, j] = t / dx
+
+            # final values are filled with those of the last segment
+            c1[i, length - 1] = c1[i, length - 2]
+            c2[i, length - 1] = c2[i, length - 2]
+            c3[i, length - 1] = c3[i, length - 2]
+
+
+def _fill_complex_modes(y_all, teuk_modes):
+    """Fill the first ``2 * num_teuk_modes`` rows of ``y_all`` with the
+    real parts of ``teuk_modes`` followed by the imaginary parts.
+
+    The complex modes are viewed as (length, num_teuk_modes, 2) reals so the
+    fill is a single strided copy.
+    """
+    xp = np if isinstance(y_all, np.ndarray) else cp
+    length, num_teuk_modes = teuk_modes.shape
+
+    teuk_modes = xp.ascontiguousarray(teuk_modes, dtype=xp.complex128)
+    y_all[: 2 * num_teuk_modes].reshape(2, num_teuk_modes, length)[:] = (
+        teuk_modes.view(xp.float64)
+        .reshape(length, num_teuk_modes, 2)
+        .transpose(2, 1, 0)
+    )
+
+
 class CubicSplineInterpolant(ParallelModuleBase):
     """GPU-accelerated Multiple Cubic Splines
 
@@ -83,10 +251,7 @@ class CubicSplineInterpolant(ParallelModuleBase):
         else:
             self.interpolate_arrays = interpolate_arrays_wrap_cpu
 
-        if self.use_gpu:
-            xp = cp
-        else:
-            xp = np
+        xp = self.xp
 
         y_all = xp.atleast_2d(y_all)
 
@@ -106,59 +271,84 @@ class CubicSplineInterpolant(ParallelModuleBase):
         # fill y
         interp_array[0] = y_all
 
-        interp_array = interp_array.flatten()
-
-        # arrays to store banded matrix and solution
-        B = xp.zeros((ninterps * length,))
-        upper_diag = xp.zeros_like(B)
-        diag = xp.zeros_like(B)
-        lower_diag = xp.zeros_like(B)
-
         if t.ndim == 1:
             if len(t) < 2:
                 raise ValueError("t must have length greater than 2.")
 
-            # could save memory by adjusting c code to treat 1D differently
-            self.t = xp.tile(t, (ninterps, 1)).flatten().astype(xp.float64)
+            # one copy of t is shared by all interpolants
+            self.t_is_shared = True
+            self.t = xp.array(t, dtype=xp.float64)
 
         elif t.ndim == 2:
             if t.shape[1] < 2:
                 raise ValueError("t must have length greater than 2 along time axis.")
 
+            self.t_is_shared = False
             self.t = t.flatten().copy().astype(xp.float64)
 
         else:
             raise ValueError("t must be 1 or 2 dimensions.")
 
-        # perform interpolation
-        self.interpolate_arrays(
-            self.t,
-            interp_array,
-            ninterps,
-            length,
-            B,
-            upper_diag,
-            diag,
-            lower_diag,
-        )
+        if not self.use_gpu and numba_available:
+            # solve the tridiagonal systems directly into the coefficient arrays
+            if self.t_is_shared:
+                t_grid = np.broadcast_to(self.t, (ninterps, length))
+            else:
+                t_grid = self.t.reshape((ninterps, length))
+
+            _fit_spline(t_grid, *interp_array)
+
+        else:
+            # arrays to store banded matrix and solution
+            B = xp.zeros((ninterps * length,))
+            upper_diag = xp.zeros_like(B)
+            diag = xp.zeros_like(B)
+            lower_diag = xp.zeros_like(B)
+
+            # perform interpolation
+            self.interpolate_arrays(
+                self.t,
+                interp_array,
+                ninterps,
+                length,
+                B,
+                upper_diag,
+                diag,
+                lower_diag,
+                self.t_is_shared,
+            )
 
         # set up storage of necessary arrays
+        # each coefficient is kept as its own contiguous (ninterps, length) block
+        self.coefficients = interp_array
+        self._y, self._c1, self._c2, self._c3 = self.coefficients
 
-        self.interp_array = xp.transpose(
-            interp_array.reshape(self.reshape_shape), [0, 2, 1]
-        ).flatten()
+        # the summation kernels read the (4, length, ninterps) layout
+        # it is built the first time it is requested
+        self._interp_array = None
 
         # update reshape_shape
         self.reshape_shape = (self.degree + 1, length, ninterps)
-        self.t = self.t.reshape((ninterps, length))
+
+        # a shared t is exposed as a (ninterps, length) view without copying
+        if self.t_is_shared:
+            self.t = xp.broadcast_to(self.t, (ninterps, length))
+        else:
+            self.t = self.t.reshape((ninterps, length))
 
     def attributes_CubicSplineInterpolate(self):
         """
         attributes:
             interpolate_arrays (func): CPU or GPU function for mode interpolation.
+            t (2D double xp.ndarray): t values with shape (ninterps, length). If
+                a 1D t array was given, this is a read-only broadcasted view.
+            t_is_shared (bool): If True, all interpolants share the same t values.
+            coefficients (3D double xp.ndarray): Spline coefficients with shape
+                (4, ninterps, length). The 4 is the 4 spline coefficients. Each
+                coefficient is stored contiguously.
             interp_array (1D double xp.ndarray): Array containing all spline
-                coefficients. It is flattened after fitting from shape
-                (4, length, ninterps). The 4 is the 4 spline coefficients.
+                coefficients. It is flattened from shape
+                (4, length, ninterps) for the summation kernels.
 
         """
 
@@ -172,48 +362,75 @@ class CubicSplineInterpolant(ParallelModuleBase):
         """Return the citation for this class"""
         return larger_few_citation + few_citation + few_software_citation
 
+    @property
+    def interp_array(self):
+        """Flattened (4, length, ninterps) coefficient array for the summation kernels"""
+        if self._interp_array is None:
+            self._interp_array = self.xp.transpose(
+                self.coefficients, [0, 2, 1]
+            ).flatten()
+
+        return self._interp_array
+
     @property
     def y(self):
         """y values associated with the spline"""
-        return self.interp_array.reshape(self.reshape_shape)[0].T
+        return self._y
 
     @property
     def c1(self):
         """constants for the linear term"""
-        return self.interp_array.reshape(self.reshape_shape)[1].T
+        return self._c1
 
     @property
     def c2(self):
         """constants for the quadratic term"""
-        return self.interp_array.reshape(self.reshape_shape)[2].T
+        return self._c2
 
     @property
     def c3(self):
         """constants for the cubic term"""
-        return self.interp_array.reshape(self.reshape_shape)[3].T
+        return self._c3
 
     def _get_inds(self, tnew):
         # find were in the old t array the new t values split
 
-        if self.use_gpu:
-            xp = cp
-        else:
-            xp = np
-
-        inds = xp.zeros((self.ninterps, tnew.shape[1]), dtype=int)
+        xp = self.xp
 
-        # Optional TODO: remove loop ? if speed needed
-        for i, (t, tnew_i) in enumerate(zip(self.t, tnew)):
-            inds[i] = xp.searchsorted(t, tnew_i, side="right") - 1
-
-            # fix end value
-            inds[i][tnew_i == t[-1]] = len(t) - 2
+        ninterps, length = self.t.shape
+        t_start = self.t[:, :1]
+        t_end = self.t[:, -1:]
 
         # get values outside the edges
-        inds_bad_left = tnew < self.t[:, 0][:, None]
-        inds_bad_right = tnew > self.t[:, -1][:, None]
+        inds_bad_left = tnew < t_start
+        inds_bad_right = tnew > t_end
+
+        if self.t_is_shared:
+            # all interpolants split at the same places
+            inds = xp.searchsorted(self.t[0], tnew, side="right") - 1
 
-        if np.any(inds < 0) or np.any(inds >= self.t.shape[1]):
+        else:
+            # binary search run on every point at once. Each interpolant is
+            # searched on its own knots so no precision is lost between them.
+            # equivalent to searchsorted(side="right") - 1 on each row
+            lo = xp.zeros(tnew.shape, dtype=xp.int64)
+            hi = xp.full(tnew.shape, length, dtype=xp.int64)
+            for _ in range(int(np.ceil(np.log2(length + 1)))):
+                mid = xp.minimum((lo + hi) // 2, length - 1)
+                go_right = xp.take_along_axis(self.t, mid, axis=1) <= tnew
+                active = lo < hi
+                lo = xp.where(active & go_right, mid + 1, lo)
+                hi = xp.where(active & ~go_right, mid, hi)
+
+            inds = lo - 1
+
+        # points left of the domain are filled with edge values later
+        inds[inds < 0] = 0
+
+        # fix end value
+        inds[tnew >= t_end] = length - 2
+
+        if xp.any(inds_bad_left):
             warnings.warn(
                 "New t array outside bounds of input t array. These points are filled with edge values."
             )
@@ -244,10 +461,7 @@ class CubicSplineInterpolant(ParallelModuleBase):
             xp.ndarray: 1D or 2D array of evaluated spline values (or derivatives).
 
         """
-        if self.use_gpu:
-            xp = cp
-        else:
-            xp = np
+        xp = self.xp
 
         tnew = xp.atleast_1d(tnew)
 
@@ -259,65 +473,77 @@ class CubicSplineInterpolant(ParallelModuleBase):
 
         # copy input to all splines
         elif tnew.ndim == 1:
-            tnew = xp.tile(tnew, (self.t.shape[0], 1))
+            if self.use_gpu or not numba_available:
+                tnew = xp.tile(tnew, (self.t.shape[0], 1))
+            else:
+                # the fused CPU kernel can read a broadcasted view
+                tnew = np.broadcast_to(tnew, (self.t.shape[0], len(tnew)))
 
         tnew = xp.atleast_2d(tnew)
 
+        # fused search and evaluation on the CPU without temporaries
+        if not self.use_gpu and numba_available:
+            if deriv_order not in [0, 1, 2, 3]:
+                raise ValueError("deriv_order must be within 0 <= deriv_order <= 3.")
+
+            outside_left = np.any(tnew < self.t[:, :1])
+            outside_right = np.any(tnew > self.t[:, -1:])
+
+            if outside_left:
+                warnings.warn(
+                    "New t array outside bounds of input t array. These points are filled with edge values."
+                )
+
+            if deriv_order > 0 and (outside_left or outside_right):
+                raise ValueError(
+                    "x points outside of the domain of the spline are not supported when taking derivatives."
+                )
+
+            out = np.empty(tnew.shape, dtype=np.float64)
+            _eval_spline(
+                self.t, self.y, self.c1, self.c2, self.c3, tnew, deriv_order, out
+            )
+            return out.squeeze()
+
+        if deriv_order not in [0, 1, 2, 3]:
+            raise ValueError("deriv_order must be within 0 <= deriv_order <= 3.")
+
         # get indices into spline
         inds, inds_bad_left, inds_bad_right = self._get_inds(tnew)
 
+        if deriv_order > 0 and (xp.any(inds_bad_right) or xp.any(inds_bad_left)):
+            raise ValueError(
+                "x points outside of the domain of the spline are not supported when taking derivatives."
+            )
+
+        # only gather the coefficients needed for this order
+        c3 = xp.take_along_axis(self.c3, inds, axis=1)
+
+        if deriv_order == 3:
+            return (6 * c3).squeeze()
+
         # x value for spline
+        x = tnew - xp.take_along_axis(self.t, inds, axis=1)
+        c2 = xp.take_along_axis(self.c2, inds, axis=1)
 
-        # indexes for which spline
-        inds0 = np.tile(np.arange(self.ninterps), (tnew.shape[1], 1)).T
-        t_here = self.t[(inds0.flatten(), inds.flatten())].reshape(
-            self.ninterps, tnew.shape[1]
-        )
+        if deriv_order == 2:
+            return (6 * c3 * x + 2 * c2).squeeze()
 
-        x = tnew - t_here
-        x2 = x * x
-        x3 = x2 * x
+        c1 = xp.take_along_axis(self.c1, inds, axis=1)
 
-        # get spline coefficients
-        y = self.y[(inds0.flatten(), inds.flatten())].reshape(
-            self.ninterps, tnew.shape[1]
-        )
-        c1 = self.c1[(inds0.flatten(), inds.flatten())].reshape(
-            self.ninterps, tnew.shape[1]
-        )
-        c2 = self.c2[(inds0.flatten(), inds.flatten())].reshape(
-            self.ninterps, tnew.shape[1]
-        )
-        c3 = self.c3[(inds0.flatten(), inds.flatten())].reshape(
-            self.ninterps, tnew.shape[1]
-        )
+        if deriv_order == 1:
+            return ((3 * c3 * x + 2 * c2) * x + c1).squeeze()
 
-        # evaluate spline
-        if deriv_order == 0:
-            out = y + c1 * x + c2 * x2 + c3 * x3
-            # fix bad values
-            if xp.any(inds_bad_left):
-                temp = xp.tile(self.y[:, 0], (tnew.shape[1], 1)).T
-                out[inds_bad_left] = temp[inds_bad_left]
+        # evaluate spline with Horner's rule
+        y = xp.take_along_axis(self.y, inds, axis=1)
+        out = ((c3 * x + c2) * x + c1) * x + y
 
-            if xp.any(inds_bad_right):
-                temp = xp.tile(self.y[:, -1], (tnew.shape[1], 1)).T
-                out[inds_bad_right] = temp[inds_bad_right]
+        # fix bad values
+        if xp.any(inds_bad_left):
+            out = xp.where(inds_bad_left, self.y[:, :1], out)
 
-        else:
-            # derivatives
-            if xp.any(inds_bad_right) or xp.any(inds_bad_left):
-                raise ValueError(
-                    "x points outside of the domain of the spline are not supported when taking derivatives."
-                )
-            if deriv_order == 1:
-                out = c1 + 2 * c2 * x + 3 * c3 * x2
-            elif deriv_order == 2:
-                out = 2 * c2 + 6 * c3 * x
-            elif deriv_order == 3:
-                out = 6 * c3
-            else:
-                raise ValueError("deriv_order must be within 0 <= deriv_order <= 3.")
+        if xp.any(inds_bad_right):
+            out = xp.where(inds_bad_right, self.y[:, -1:], out)
 
         return out.squeeze()
 
@@ -346,6 +572,12 @@ class InterpolatedModeSum(SummationBase, SchwarzschildEccentric, ParallelModuleB
         else:
             self.get_waveform = get_waveform_wrap_cpu
 
+        # page-locked host buffer for the time array, reused across calls
+        self._h_t_pinned = None
+
+        # device is looked up once rather than on every call
+        self._dev = int(cp.cuda.runtime.getDevice()) if self.use_gpu else 0
+
     def attributes_InterpolatedModeSum(self):
         """
         attributes:
@@ -402,10 +634,7 @@ class InterpolatedModeSum(SummationBase, SchwarzschildEccentric, ParallelModuleB
 
         """
 
-        if self.use_gpu:
-            xp = cp
-        else:
-            xp = np
+        xp = self.xp
 
         init_len = len(t)
         num_teuk_modes = teuk_modes.shape[1]
@@ -415,23 +644,27 @@ class InterpolatedModeSum(SummationBase, SchwarzschildEccentric, ParallelModuleB
         ninterps = self.ndim + 2 * num_teuk_modes  # 2 for re and im
         y_all = xp.zeros((ninterps, length))
 
-        y_all[:num_teuk_modes] = teuk_modes.T.real
-        y_all[num_teuk_modes : 2 * num_teuk_modes] = teuk_modes.T.imag
+        _fill_complex_modes(y_all, teuk_modes)
 
         y_all[-2] = Phi_phi
         y_all[-1] = Phi_r
 
         spline = CubicSplineInterpolant(t, y_all, use_gpu=self.use_gpu)
 
-        try:
-            h_t = t.get()
-        except:
-            h_t = t
+        # the kernel launches are set up on the host from the time array
+        if self.use_gpu:
+            # grown only when a longer trajectory comes in
+            if (
+                self._h_t_pinned is None
+                or len(self._h_t_pinned) < len(t)
+                or self._h_t_pinned.dtype != t.dtype
+            ):
+                self._h_t_pinned = cupyx.empty_pinned(t.shape, dtype=t.dtype)
+
+            h_t = t.get(out=self._h_t_pinned[: len(t)])
 
-        if not self.use_gpu:
-            dev = 0
         else:
-            dev = int(xp.cuda.runtime.getDevice())
+            h_t = t
 
         # the base class function __call__ will return the waveform
         self.get_waveform(
@@ -445,5 +678,5 @@ class InterpolatedModeSum(SummationBase, SchwarzschildEccentric, ParallelModuleB
             ylms,
             dt,
             h_t,
-            dev,
+            self._dev,
         )
@@ -7,7 +7,12 @@ from few.trajectory.inspiral import EMRIInspiral
 from few.amplitude.romannet import RomanAmplitude
 from few.amplitude.interp2dcubicspline import Interp2DAmplitude
 from few.waveform import FastSchwarzschildEccentricFlux, SlowSchwarzschildEccentricFlux
-from few.utils.utility import get_overlap, get_mismatch
+from few.utils.utility import (
+    get_overlap,
+    get_mismatch,
+    get_fundamental_frequencies,
+    get_schwarzschild_frequencies,
+)
 from few.utils.ylm import GetYlms
 from few.utils.modeselector import ModeSelector
 from few.summation.interpolatedmodesum import CubicSplineInterpolant
@@ -246,3 +251,142 @@ class ModuleTest(unittest.TestCase):
         x2 = np.sin(t) + 1j * np.cos(t)
         self.assertAlmostEqual(get_overlap(x0, x2), 0.499981442642142)
         self.assertAlmostEqual(1.0 - get_overlap(x0, x1), get_mismatch(x0, x1))
+
+    def test_cubic_spline(self):
+        from scipy.interpolate import CubicSpline
+
+        t = np.linspace(0.0, 10.0, 100)
+        y_all = np.array([np.sin(t), np.cos(t) * t])
+
+        spl = CubicSplineInterpolant(t, y_all)
+        check = CubicSpline(t, y_all, axis=1)
+
+        t_new = np.linspace(0.0, 10.0, 1000)
+        for deriv_order in range(4):
+            self.assertTrue(
+                np.allclose(
+                    spl(t_new, deriv_order=deriv_order),
+                    check(t_new, nu=deriv_order),
+                    atol=1e-10,
+                )
+            )
+
+    def test_cubic_spline_2d(self):
+        from scipy.interpolate import CubicSpline
+        from unittest.mock import patch
+
+        # rows with very different spans and offsets
+        t = np.array(
+            [
+                np.linspace(0.0, 1e10, 50),
+                np.linspace(5.0, 5.0 + 1e-6, 50),
+                np.linspace(-3.0, 7.0, 50) ** 3,
+            ]
+        )
+        y_all = np.array(
+            [
+                np.sin(0.3 * np.arange(50)),
+                np.cos(0.2 * np.arange(50)),
+                np.sin(0.02 * t[2]),
+            ]
+        )
+
+        spl = CubicSplineInterpolant(t, y_all)
+
+        t_new = np.array([np.linspace(row[0], row[-1], 300) for row in t])
+
+        # check both the numba evaluation and the array evaluation
+        for use_numba in [True, False]:
+            with patch(
+                "few.summation.interpolatedmodesum.numba_available", use_numba
+            ):
+                for deriv_order in range(4):
+                    out = spl(t_new, deriv_order=deriv_order)
+                    for i in range(len(t)):
+                        check = CubicSpline(t[i], y_all[i])(t_new[i], nu=deriv_order)
+                        self.assertTrue(
+                            np.allclose(
+                                out[i], check, rtol=1e-8, atol=1e-8 * np.abs(check).max()
+                            )
+                        )
+
+    def test_mode_selector_numba(self):
+        from unittest.mock import patch
+        import few.utils.modeselector as modeselector
+
+        if not modeselector.numba_available:
+            self.skipTest("numba is not installed")
+
+        rng = np.random.default_rng(12)
+
+        # modes are ordered m = 0, m > 0 and then m < 0
+        num_m0 = 10
+        num_m_1_up = 200
+        num_modes = num_m0 + num_m_1_up
+        m0mask = np.r_[np.zeros(num_m0, dtype=bool), np.ones(num_m_1_up, dtype=bool)]
+
+        l_arr = rng.integers(2, 11, size=num_modes)
+        m_arr = np.r_[np.zeros(num_m0, dtype=int), rng.integers(1, 11, size=num_m_1_up)]
+        n_arr = rng.integers(-30, 31, size=num_modes)
+        modeinds = [
+            np.r_[l_arr, l_arr[m0mask]],
+            np.r_[m_arr, -m_arr[m0mask]],
+            np.r_[n_arr, n_arr[m0mask]],
+        ]
+
+        num_pts = 40
+        teuk_modes = (
+            rng.normal(size=(num_pts, num_modes))
+            + 1j * rng.normal(size=(num_pts, num_modes))
+        ) * np.exp(rng.normal(0.0, 3.0, size=num_modes))
+
+        # two equal modes straddle the cutoff when eps = 0.3
+        teuk_modes[3] = 1e-8
+        teuk_modes[3, :3] = np.sqrt([10.0, 5.0, 5.0])
+
+        # a point with no power at all
+        teuk_modes[7] = 0.0
+
+        # unit magnitude so the ties above stay exact
+        ylms = np.exp(1j * rng.uniform(0.0, 2 * np.pi, size=num_modes + num_m_1_up))
+
+        def sensitivity_fn(f):
+            return 1.0 + (f * 1e3) ** 2
+
+        fund_freq_args = (
+            1e6,
+            0.0,
+            np.linspace(12.0, 8.0, num_pts),
+            np.linspace(0.4, 0.1, num_pts),
+            np.zeros(num_pts),
+        )
+
+        # the numba and NumPy selections must keep the same modes
+        for sens_fn in [None, sensitivity_fn]:
+            for eps in [0.3, 1e-5]:
+                out = []
+                for use_numba in [True, False]:
+                    with patch("few.utils.modeselector.numba_available", use_numba):
+                        mode_selector = ModeSelector(m0mask, sensitivity_fn=sens_fn)
+                        out.append(
+                            mode_selector(
+                                teuk_modes,
+                                ylms,
+                                modeinds,
+                                fund_freq_args=fund_freq_args,
+                                eps=eps,
+                            )
+                        )
+
+                for arr, arr_check in zip(*out):
+                    self.assertTrue(np.array_equal(arr, arr_check))
+
+    def test_schwarzschild_frequencies(self):
+        p = np.linspace(8.0, 14.0, 20)
+        e = np.linspace(0.05, 0.6, 20)
+
+        check = get_fundamental_frequencies(0.0, p, e, np.zeros_like(e))
+        freqs = get_schwarzschild_frequencies(p, e)
+
+        for freq, freq_check in zip(freqs, check):
+            self.assertTrue(np.allclose(freq, freq_check))
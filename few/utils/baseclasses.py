@@ -72,6 +72,11 @@ class ParallelModuleBase(ABC):
         # checks if gpu capability is available if requested
         self.sanity_check_gpu(use_gpu)
 
+    @property
+    def xp(self):
+        """Either numpy or CuPy based on gpu preference"""
+        return cp if self.use_gpu else np
+
     @classmethod
     @property
     def gpu_capability(self):
@@ -19,7 +19,10 @@
 import numpy as np
 
 from few.utils.citations import *
-from few.utils.utility import get_fundamental_frequencies
+from few.utils.utility import (
+    get_fundamental_frequencies,
+    get_schwarzschild_frequencies,
+)
 from few.utils.constants import *
 from few.utils.baseclasses import ParallelModuleBase
 
@@ -27,9 +30,283 @@ from few.utils.baseclasses import ParallelModuleBase
 try:
     import cupy as cp
 
+    # power of each mode including m < 0 written directly into one array
+    # |a * b|^2 = |a|^2 |b|^2 and conjugation leaves |a|^2 unchanged, so each
+    # |teuk|^2 is computed once and also used for its m < 0 column, which sits
+    # num_m_1_up columns after the m > 0 mode
+    _mode_power_params = (
+        "complex128 teuk_modes, raw float64 ylms_abs2, int64 num_m0, int64 num_m_1_up"
+    )
+    _mode_power_source = """
+        ptrdiff_t num_m_zero_up = num_m0 + num_m_1_up;
+        ptrdiff_t row = i / num_m_zero_up;
+        ptrdiff_t col = i % num_m_zero_up;
+        ptrdiff_t ind = row * (num_m_zero_up + num_m_1_up) + col;
+
+        double teuk_abs2 = norm(teuk_modes);
+        power[ind] = teuk_abs2 * ylms_abs2[col] WEIGHT(ind);
+        if (col >= num_m0)
+        {
+            power[ind + num_m_1_up] = teuk_abs2 * ylms_abs2[col + num_m_1_up] WEIGHT(ind + num_m_1_up);
+        }
+        """
+
+    _mode_power_kernel = cp.ElementwiseKernel(
+        _mode_power_params,
+        "raw float64 power",
+        _mode_power_source,
+        "mode_power",
+        preamble="#define WEIGHT(ind)",
+    )
+
+    # same as above with the noise weighting applied in the same write
+    _mode_power_psd_kernel = cp.ElementwiseKernel(
+        _mode_power_params + ", raw float64 PSD",
+        "raw float64 power",
+        _mode_power_source,
+        "mode_power_psd",
+        preamble="#define WEIGHT(ind) / PSD[ind]",
+    )
+
+    # |m f_phi + n f_r| for every trajectory point and mode
+    _mode_freqs_kernel = cp.ElementwiseKernel(
+        "raw float64 OmegaPhi, raw float64 OmegaR, raw T m_arr, raw T n_arr, float64 factor, int64 num_cols",
+        "float64 freqs",
+        """
+        ptrdiff_t row = i / num_cols;
+        ptrdiff_t col = i % num_cols;
+        freqs = fabs(m_arr[col] * OmegaPhi[row] + n_arr[col] * OmegaR[row]) * factor;
+        """,
+        "mode_freqs",
+    )
+
+    # one block per trajectory point finds the smallest power value v for which
+    # the modes louder than v sum to less than (1 - eps) of the total. Every mode
+    # with at least that power is kept. Bisection runs on the bit pattern of v,
+    # which is ordered like the value itself for non-negative doubles.
+    _SELECT_MODES_NUM_THREADS = 256
+
+    _select_modes_kernel = cp.RawKernel(
+        r"""
+        #define NUM_THREADS 256
+
+        __device__ double block_sum(double val, double* shared)
+        {
+            shared[threadIdx.x] = val;
+            __syncthreads();
+            for (int s = NUM_THREADS / 2; s > 0; s >>= 1)
+            {
+                if (threadIdx.x < s) shared[threadIdx.x] += shared[threadIdx.x + s];
+                __syncthreads();
+            }
+            double out = shared[0];
+            __syncthreads();
+            return out;
+        }
+
+        __device__ double block_max(double val, double* shared)
+        {
+            shared[threadIdx.x] = val;
+            __syncthreads();
+            for (int s = NUM_THREADS / 2; s > 0; s >>= 1)
+            {
+                if (threadIdx.x < s) shared[threadIdx.x] = fmax(shared[threadIdx.x], shared[threadIdx.x + s]);
+                __syncthreads();
+            }
+            double out = shared[0];
+            __syncthreads();
+            return out;
+        }
+
+        __device__ int block_min_int(int val, int* shared)
+        {
+            shared[threadIdx.x] = val;
+            __syncthreads();
+            for (int s = NUM_THREADS / 2; s > 0; s >>= 1)
+            {
+                if (threadIdx.x < s) shared[threadIdx.x] = min(shared[threadIdx.x], shared[threadIdx.x + s]);
+                __syncthreads();
+            }
+            int out = shared[0];
+            __syncthreads();
+            return out;
+        }
+
+        extern "C" __global__
+        void select_modes_row(const double* power, unsigned char* keep, double frac,
+                              int num_cols, int num_m_zero_up, int num_m_1_up)
+        {
+            __shared__ double shared[NUM_THREADS];
+            __shared__ int shared_ind[NUM_THREADS];
+
+            const double* row = &power[(long long)blockIdx.x * num_cols];
+
+            double total = 0.0;
+            double max_val = 0.0;
+            for (int i = threadIdx.x; i < num_cols; i += NUM_THREADS)
+            {
+                total += row[i];
+                max_val = fmax(max_val, row[i]);
+            }
+            double thresh = block_sum(total, shared) * frac;
+            max_val = block_max(max_val, shared);
+
+            // all modes silent: keep only the first loudest mode like the CPU paths
+            if (!(thresh > 0.0))
+            {
+                int first = num_cols;
+                for (int i = threadIdx.x; i < num_cols; i += NUM_THREADS)
+                {
+                    if (row[i] == max_val) first = min(first, i);
+                }
+                first = block_min_int(first, shared_ind);
+
+                if ((threadIdx.x == 0) && (first < num_cols))
+                {
+                    keep[(first < num_m_zero_up) ? first : first - num_m_1_up] = 1;
+                }
+                return;
+            }
+
+            // the loudest mode is always kept
+            unsigned long long lo = 0;
+            unsigned long long hi = (unsigned long long)__double_as_longlong(max_val);
+            while (lo < hi)
+            {
+                unsigned long long mid = lo + (hi - lo) / 2;
+                double v = __longlong_as_double((long long)mid);
+
+                double above = 0.0;
+                for (int i = threadIdx.x; i < num_cols; i += NUM_THREADS)
+                {
+                    if (row[i] > v) above += row[i];
+                }
+                above = block_sum(above, shared);
+
+                if (above < thresh) hi = mid;
+                else lo = mid + 1;
+            }
+            double cutoff = __longlong_as_double((long long)lo);
+
+            // -m modes are stored against their +m counterpart
+            for (int i = threadIdx.x; i < num_cols; i += NUM_THREADS)
+            {
+                if (row[i] >= cutoff)
+                {
+                    keep[(i < num_m_zero_up) ? i : i - num_m_1_up] = 1;
+                }
+            }
+        }
+        """,
+        "select_modes_row",
+    )
+
 except (ImportError, ModuleNotFoundError) as e:
     import numpy as np
 
+# numba is optional; it accelerates the CPU mode selection
+try:
+    from numba import njit, prange
+
+    numba_available = True
+
+except (ImportError, ModuleNotFoundError) as e:
+    numba_available = False
+
+
+if numba_available:
+
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _select_modes_numba(power, inds_work, keep, frac, num_m_zero_up, num_m_1_up):
+        """Mark the modes needed to reach a fraction of the power on the CPU.
+
+        A mode is kept when the modes louder than it hold less than
+        :code:`frac` of the total power at that trajectory point. Rather than
+        sorting, each point is repeatedly split into louder, equal and quieter
+        modes around a pivot (quickselect weighted by power), which finds the
+        kept modes in expected linear time. :code:`inds_work` holds the mode
+        order for each point while it is split. Kept -m modes are marked against
+        their +m counterpart in the shared :code:`keep` bitmap.
+
+        """
+        num_pts, num_modes = power.shape
+
+        for i in prange(num_pts):
+            row = power[i]
+            thresh = row.sum() * frac
+
+            # all modes silent: keep the loudest like a full sort would
+            if not thresh > 0.0:
+                ind = np.argmax(row)
+                keep[ind if ind < num_m_zero_up else ind - num_m_1_up] = 1
+                continue
+
+            inds = inds_work[i]
+            for k in range(num_modes):
+                inds[k] = k
+
+            # power of the modes already kept, louder than everything in [start, end)
+            above = 0.0
+            start = 0
+            end = num_modes
+            while start < end:
+                pivot = row[inds[(start + end) // 2]]
+
+                # order [start, end) as louder | equal | quieter than the pivot
+                louder = start
+                quieter = end
+                louder_power = 0.0
+                k = start
+                while k < quieter:
+                    val = row[inds[k]]
+                    if val > pivot:
+                        inds[louder], inds[k] = inds[k], inds[louder]
+                        louder += 1
+                        k += 1
+                        louder_power += val
+                    elif val < pivot:
+                        quieter -= 1
+                        inds[quieter], inds[k] = inds[k], inds[quieter]
+                    else:
+                        k += 1
+
+                if above + louder_power >= thresh:
+                    # the pivot is not needed so the cutoff is among the louder modes
+                    end = louder
+
+                else:
+                    # the pivot and every louder mode are kept
+                    for k in range(start, quieter):
+                        ind = inds[k]
+                        keep[ind if ind < num_m_zero_up else ind - num_m_1_up] = 1
+
+                    above += louder_power + pivot * (quieter - louder)
+                    start = quieter
+
+
+def _freq_args_match(args, cached_args):
+    """Check fundamental frequency arguments against cached copies.
+
+    Arrays are compared where they live, so on the GPU only the final
+    boolean is copied back to the host.
+
+    """
+    if len(args) != len(cached_args):
+        return False
+
+    for arg, cached in zip(args, cached_args):
+        if hasattr(arg, "shape") != hasattr(cached, "shape"):
+            return False
+
+        elif hasattr(arg, "shape"):
+            if arg.shape != cached.shape or not bool((arg == cached).all()):
+                return False
+
+        elif arg != cached:
+            return False
+
+    return True
+
 
 class ModeSelector(ParallelModuleBase):
     """Filter teukolsky amplitudes based on power contribution.
@@ -75,11 +352,40 @@ class ModeSelector(ParallelModuleBase):
         # the order is m = 0, m > 0, m < 0
         self.m0mask = m0mask
         self.num_m_zero_up = len(m0mask)
-        self.num_m_1_up = len(xp.arange(len(m0mask))[m0mask])
-        self.num_m0 = len(xp.arange(len(m0mask))[~m0mask])
+        self.num_m_1_up = int(m0mask.sum())
+        self.num_m0 = self.num_m_zero_up - self.num_m_1_up
 
         self.sensitivity_fn = sensitivity_fn
 
+        # work arrays reused between calls. See :meth:`_get_buffer`.
+        self._buffers = {}
+
+        # last PSD evaluation with the inputs it was computed from
+        self._psd_cache = None
+
+        # marks the (m >= 0) modes kept at any trajectory point
+        self._keep_bitmap = xp.zeros(self.num_m_zero_up, dtype=xp.uint8)
+
+    def _get_buffer(self, name, shape, dtype=np.float64):
+        """Get a reusable work array.
+
+        Buffers only grow along the first axis, so trajectories of different
+        lengths share one allocation. The returned array is a contiguous view
+        of the leading rows.
+
+        """
+        buf = self._buffers.get(name)
+        if (
+            buf is None
+            or buf.dtype != dtype
+            or buf.shape[0] < shape[0]
+            or buf.shape[1:] != shape[1:]
+        ):
+            buf = self.xp.empty(shape, dtype=dtype)
+            self._buffers[name] = buf
+
+        return buf[: shape[0]]
+
     @property
     def gpu_capability(self):
         """Confirms GPU capability"""
@@ -122,7 +428,7 @@ class ModeSelector(ParallelModuleBase):
                 :math:`(l,m,k,n)` arrays. e.g. [l_arr, m_arr, n_arr].
             fund_freq_args (tuple, optional): Args necessary to determine
                 fundamental frequencies along trajectory. The tuple will represent
-                :math:`(M, a, e, p, \cos\iota)` where the large black hole mass (:math:`M`)
+                :math:`(M, a, p, e, \cos\iota)` where the large black hole mass (:math:`M`)
                 and spin (:math:`a`) are scalar and the other three quantities are xp.ndarrays.
                 This must be provided if sensitivity weighting is used. Default is None.
             eps (double, optional): Fractional accuracy of the total power used
@@ -141,76 +447,222 @@ class ModeSelector(ParallelModuleBase):
         else:
             xp = np
 
-        # get the power contribution of each mode including m < 0
-        power = (
-            xp.abs(
-                xp.concatenate(
-                    [teuk_modes, xp.conj(teuk_modes[:, self.m0mask])], axis=1
-                )
-                * ylms
-            )
-            ** 2
-        )
-
         # if noise weighting
+        PSD = None
         if self.sensitivity_fn is not None:
             if fund_freq_args is None:
                 raise ValueError(
                     "If sensitivity weighting is desired, the fund_freq_args kwarg must be provided."
                 )
 
-            M = fund_freq_args[0]
-            Msec = M * MTSUN_SI
+            # the PSD only changes with the trajectory and mode values so it is
+            # reused when called again with the same inputs
+            cache = self._psd_cache
+            if (
+                cache is not None
+                and cache[1] is self.sensitivity_fn
+                and cache[2] is modeinds[1]
+                and cache[3] is modeinds[2]
+                and _freq_args_match(fund_freq_args, cache[0])
+            ):
+                PSD = cache[4]
+
+            else:
+                M, a, p, e, x = fund_freq_args
+                Msec = float(M) * MTSUN_SI
+
+                # get dimensionless fundamental frequency
+                # OmegaTheta is not needed for the equatorial mode frequencies
+                if isinstance(a, (int, float)) and a == 0.0:
+                    OmegaPhi, _, OmegaR = get_schwarzschild_frequencies(
+                        p, e, use_gpu=self.use_gpu
+                    )
+
+                else:
+                    if self.use_gpu:
+                        p, e, x = cp.asnumpy(p), cp.asnumpy(e), cp.asnumpy(x)
+
+                    OmegaPhi, _, OmegaR = get_fundamental_frequencies(a, p, e, x)
+
+                    # one transfer for both frequencies
+                    OmegaPhi, OmegaR = xp.asarray(np.stack([OmegaPhi, OmegaR]))
+
+                # TODO: update when in kerr
+                # frequencies in Hz made positive for the sensitivity function
+                freqs_shape = (len(OmegaPhi), len(modeinds[1]))
+                factor = 1.0 / (Msec * 2 * PI)
+                freqs_in = self._get_buffer("freqs", freqs_shape)
+                if self.use_gpu:
+                    _mode_freqs_kernel(
+                        OmegaPhi,
+                        OmegaR,
+                        modeinds[1],
+                        modeinds[2],
+                        factor,
+                        freqs_shape[1],
+                        freqs_in,
+                    )
+
+                else:
+                    xp.abs(
+                        modeinds[1][xp.newaxis, :] * OmegaPhi[:, xp.newaxis]
+                        + modeinds[2][xp.newaxis, :] * OmegaR[:, xp.newaxis],
+                        out=freqs_in,
+                    )
+                    freqs_in *= factor
+
+                PSD = self.sensitivity_fn(freqs_in.ravel()).reshape(freqs_shape)
+
+                # arrays are copied so later in-place changes by the caller are seen
+                self._psd_cache = (
+                    tuple(
+                        arg.copy() if hasattr(arg, "shape") else arg
+                        for arg in fund_freq_args
+                    ),
+                    self.sensitivity_fn,
+                    modeinds[1],
+                    modeinds[2],
+                    PSD,
+                )
 
-            # get dimensionless fundamental frequency
-            OmegaPhi, OmegaTheta, OmegaR = get_fundamental_frequencies(
-                *fund_freq_args[1:]
-            )
+        # get the power contribution of each mode including m < 0
+        # without building the concatenated complex array
+        num_pts = teuk_modes.shape[0]
+        power_shape = (num_pts, self.num_m_zero_up + self.num_m_1_up)
+        power = self._get_buffer("power", power_shape)
 
-            # get frequencies in Hz
-            f_Phi, f_omega, f_r = OmegaPhi, OmegaTheta, OmegaR = (
-                xp.asarray(OmegaPhi) / (Msec * 2 * PI),
-                xp.asarray(OmegaTheta) / (Msec * 2 * PI),
-                xp.asarray(OmegaR) / (Msec * 2 * PI),
-            )
+        ylms_abs2 = (ylms.real**2 + ylms.imag**2).astype(xp.float64, copy=False)
 
-            # TODO: update when in kerr
-            freqs = (
-                modeinds[1][xp.newaxis, :] * f_Phi[:, xp.newaxis]
-                + modeinds[2][xp.newaxis, :] * f_r[:, xp.newaxis]
+        if self.use_gpu:
+            power_args = (
+                teuk_modes.astype(xp.complex128, copy=False),
+                ylms_abs2,
+                self.num_m0,
+                self.num_m_1_up,
             )
 
-            freqs_shape = freqs.shape
+            # weight by PSD while the power is written
+            if PSD is None:
+                _mode_power_kernel(*power_args, power)
+            else:
+                _mode_power_psd_kernel(
+                    *power_args, xp.ascontiguousarray(PSD, dtype=xp.float64), power
+                )
 
-            # make all frequencies positive
-            freqs_in = xp.abs(freqs)
-            PSD = self.sensitivity_fn(freqs_in.flatten()).reshape(freqs_shape)
+        else:
+            # |a * b|^2 = |a|^2 |b|^2 and conjugation leaves |a|^2 unchanged
+            # so the m > 0 values are reused for the m < 0 half
+            teuk_abs2 = teuk_modes.real**2 + teuk_modes.imag**2
+            xp.multiply(
+                teuk_abs2,
+                ylms_abs2[: self.num_m_zero_up],
+                out=power[:, : self.num_m_zero_up],
+            )
+            xp.multiply(
+                teuk_abs2[:, self.num_m0 :],
+                ylms_abs2[self.num_m_zero_up :],
+                out=power[:, self.num_m_zero_up :],
+            )
 
             # weight by PSD
-            power /= PSD
+            if PSD is not None:
+                xp.divide(power, PSD, out=power)
+
+        # deduplicate kept modes across trajectory points with a bitmap
+        keep = self._keep_bitmap
+        keep[:] = 0
 
-        # sort the power for a cumulative summation
-        inds_sort = xp.argsort(power, axis=1)[:, ::-1]
-        power = xp.sort(power, axis=1)[:, ::-1]
-        cumsum = xp.cumsum(power, axis=1)
+        if self.use_gpu:
+            # sort, cumulative sum and threshold fused into one pass per point
+            _select_modes_kernel(
+                (num_pts,),
+                (_SELECT_MODES_NUM_THREADS,),
+                (
+                    power,
+                    keep,
+                    np.float64(1 - eps),
+                    np.int32(power.shape[1]),
+                    np.int32(self.num_m_zero_up),
+                    np.int32(self.num_m_1_up),
+                ),
+            )
 
-        # initialize and indices array for keeping modes
-        inds_keep = xp.full(cumsum.shape, True)
+        elif numba_available:
+            _select_modes_numba(
+                power,
+                self._get_buffer("inds", power_shape, dtype=np.int64),
+                keep,
+                1 - eps,
+                self.num_m_zero_up,
+                self.num_m_1_up,
+            )
 
-        # keep modes that add to within the fractional power (1 - eps)
-        inds_keep[:, 1:] = cumsum[:, :-1] < cumsum[:, -1][:, xp.newaxis] * (1 - eps)
+        else:
+            # power needed at each point to reach (1 - eps) of the total
+            num_modes = power.shape[1]
+            thresh = power.sum(axis=1) * (1 - eps)
+
+            # all modes silent: only the first loudest mode is kept like the other paths
+            silent = ~(thresh > 0.0)
+
+            # only the largest modes at each point are sorted for the cumulative
+            # summation. k is doubled until every point reaches the threshold
+            # within its k largest modes so no contributing mode is missed.
+            k = min(64, num_modes)
+            while True:
+                if k < num_modes:
+                    inds_sort = xp.argpartition(-power, k - 1, axis=1)[:, :k]
+                else:
+                    inds_sort = xp.tile(xp.arange(num_modes), (power.shape[0], 1))
+
+                power_sort = xp.take_along_axis(power, inds_sort, axis=1)
+                order = xp.argsort(-power_sort, axis=1)
+                inds_sort = xp.take_along_axis(inds_sort, order, axis=1)
+                power_sort = xp.take_along_axis(power_sort, order, axis=1)
+                cumsum = xp.cumsum(
+                    power_sort,
+                    axis=1,
+                    out=self._get_buffer("cumsum", power_shape)[:, :k],
+                )
 
-        # finds indices of each mode to be kept
-        temp = inds_sort[inds_keep]
+                if k == num_modes or bool(xp.all(cumsum[:, -1] >= thresh)):
+                    # keep modes that add to within the fractional power (1 - eps)
+                    # cumsum is non-decreasing so the kept modes lead each row
+                    num_keep = 1 + (cumsum[:, :-1] < thresh[:, xp.newaxis]).sum(axis=1)
+
+                    # modes tied with the quietest kept mode are kept as well
+                    cutoff = xp.take_along_axis(
+                        power_sort, (num_keep - 1)[:, xp.newaxis], axis=1
+                    )
+                    num_keep = (power_sort >= cutoff).sum(axis=1)
+
+                    # ties may continue past the k sorted modes
+                    if k == num_modes or bool(
+                        xp.all((power_sort[:, -1] < cutoff[:, 0]) | silent)
+                    ):
+                        break
+
+                k = min(2 * k, num_modes)
+
+            num_keep[silent] = 1
+            inds_sort[silent, 0] = xp.argmax(power[silent], axis=1)
+
+            # finds indices of each mode to be kept
+            row_start = xp.cumsum(num_keep) - num_keep
+            rows = xp.repeat(xp.arange(num_pts), num_keep)
+            cols = xp.arange(rows.shape[0]) - xp.repeat(row_start, num_keep)
+            temp = inds_sort[rows, cols]
+
+            # adjust the index arrays to make -m indices equal to +m indices
+            # if +m or -m contributes, we keep both because of structure of CUDA kernel
+            temp = temp * (temp < self.num_m_zero_up) + (temp - self.num_m_1_up) * (
+                temp >= self.num_m_zero_up
+            )
 
-        # adjust the index arrays to make -m indices equal to +m indices
-        # if +m or -m contributes, we keep both because of structure of CUDA kernel
-        temp = temp * (temp < self.num_m_zero_up) + (temp - self.num_m_1_up) * (
-            temp >= self.num_m_zero_up
-        )
+            keep[temp] = 1
 
         # if +m or -m contributes, we keep both because of structure of CUDA kernel
-        keep_modes = xp.unique(temp)
+        keep_modes = xp.nonzero(keep)[0]
 
         # set ylms
 
@@ -226,6 +678,9 @@ class ModeSelector(ParallelModuleBase):
         out1 = (teuk_modes[:, keep_modes], ylms[ylmkeep])
 
         # setup up mode values that have been kept
+        # each array is gathered separately so it owns its own memory. The
+        # C wrappers take the base pointer of a cupy allocation, which would
+        # drop the offset of a row view into a stacked array.
         out2 = tuple([arr[keep_modes] for arr in modeinds])
 
         return out1 + out2
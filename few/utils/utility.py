@@ -27,6 +27,7 @@ from scipy.optimize import brentq
 
 from pyUtility import (
     pyKerrGeoCoordinateFrequencies,
+    pySchwarzschildGeoCoordinateFrequencies,
     pyGetSeparatrix,
     pyKerrGeoConstantsOfMotionVectorized,
     pyY_to_xI_vector,
@@ -220,6 +221,58 @@ def get_fundamental_frequencies(a, p, e, x):
         return (OmegaPhi, OmegaTheta, OmegaR)
 
 
+def get_schwarzschild_frequencies(p, e, use_gpu=False):
+    """Get dimensionless fundamental frequencies in Schwarzschild.
+
+    Specialization of :func:`get_fundamental_frequencies` for :math:`a=0`.
+    It evaluates the Schwarzschild expressions directly, so no spin or
+    inclination arrays are needed.
+
+    arguments:
+        p (double scalar or 1D double xp.ndarray): Values of separation,
+            :math:`p`.
+        e (double scalar or 1D double xp.ndarray): Values of eccentricity,
+            :math:`e`.
+        use_gpu (bool, optional): If True, inputs may be CuPy arrays and array
+            outputs are returned as CuPy arrays. The evaluation itself is
+            performed on the CPU. Default is False.
+
+    returns:
+        tuple: Tuple of (OmegaPhi, OmegaTheta, OmegaR).
+            These are 1D arrays or scalar values depending on inputs.
+            In Schwarzschild, OmegaTheta is equal to OmegaPhi.
+
+    """
+
+    # check if inputs are scalar or array
+    if isinstance(p, float):
+        scalar = True
+
+    else:
+        scalar = False
+
+    # the elliptic integrals are evaluated on the CPU
+    if use_gpu:
+        p, e = cp.asnumpy(p), cp.asnumpy(e)
+
+    p_in = np.ascontiguousarray(np.atleast_1d(p), dtype=np.float64)
+    e_in = np.ascontiguousarray(np.atleast_1d(e), dtype=np.float64)
+
+    assert len(p_in) == len(e_in)
+
+    # get frequencies
+    OmegaPhi, OmegaR = pySchwarzschildGeoCoordinateFrequencies(p_in, e_in)
+
+    # set output to shape of input
+    if scalar:
+        return (OmegaPhi[0], OmegaPhi[0], OmegaR[0])
+
+    if use_gpu:
+        OmegaPhi, OmegaR = cp.asarray(OmegaPhi), cp.asarray(OmegaR)
+
+    return (OmegaPhi, OmegaPhi, OmegaR)
+
+
 def get_kerr_geo_constants_of_motion(a, p, e, x):
     """Get Kerr constants of motion.
 
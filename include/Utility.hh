@@ -21,6 +21,8 @@ void KerrGeoCoordinateFrequenciesVectorized(double* OmegaPhi_, double* OmegaThet
                               double* a, double* p, double* e, double* x, int length);
 
 void SchwarzschildGeoCoordinateFrequencies(double* OmegaPhi, double* OmegaR, double p, double e);
+void SchwarzschildGeoCoordinateFrequenciesVectorized(double* OmegaPhi_, double* OmegaR_,
+                              double* p, double* e, int length);
 
 double get_separatrix(double a, double e, double x);
 void get_separatrix_vector(double* separatrix, double* a, double* e, double* x, int length);
@@ -24,7 +24,7 @@ CuSparse error checking
 
 #endif
 
-void interpolate_arrays(double *t_arr, double *interp_array, int ninterps, int length, double *B, double *upper_diag, double *diag, double *lower_diag);
+void interpolate_arrays(double *t_arr, double *interp_array, int ninterps, int length, double *B, double *upper_diag, double *diag, double *lower_diag, bool t_is_shared);
 
 void get_waveform(cmplx *d_waveform, double *interp_array,
               int *d_m, int *d_n, int init_len, int out_len, int num_teuk_modes, cmplx *d_Ylms,
@@ -331,6 +331,15 @@ void SchwarzschildGeoCoordinateFrequencies(double* OmegaPhi, double* OmegaR, dou
       Power(-4 + p,2));
 }
 
+void SchwarzschildGeoCoordinateFrequenciesVectorized(double* OmegaPhi_, double* OmegaR_,
+                              double* p, double* e, int length)
+{
+    for (int i = 0; i < length; i += 1)
+    {
+        SchwarzschildGeoCoordinateFrequencies(&OmegaPhi_[i], &OmegaR_[i], p[i], e[i]);
+    }
+}
+
 void KerrGeoCoordinateFrequenciesVectorized(double* OmegaPhi_, double* OmegaTheta_, double* OmegaR_,
                               double* a, double* p, double* e, double* x, int length)
 {
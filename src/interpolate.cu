@@ -115,7 +115,7 @@ void prep_splines(int i, int length, double *b, double *ud, double *diag, double
 // according to scipy Cubic Spline
 CUDA_KERNEL
 void fill_B(double *t_arr, double *y_all, double *B, double *upper_diag, double *diag, double *lower_diag,
-            int ninterps, int length)
+            int ninterps, int length, bool t_is_shared)
 {
 
 #ifdef __CUDACC__
@@ -149,7 +149,9 @@ for (int interp_i = start1;
     {
 
       int lead_ind = interp_i * length;
-      prep_splines(i, length, &B[lead_ind], &upper_diag[lead_ind], &diag[lead_ind], &lower_diag[lead_ind], &t_arr[lead_ind], &y_all[interp_i * length]);
+      // all interpolants read the same time array if it is shared
+      int t_lead_ind = t_is_shared ? 0 : lead_ind;
+      prep_splines(i, length, &B[lead_ind], &upper_diag[lead_ind], &diag[lead_ind], &lower_diag[lead_ind], &t_arr[t_lead_ind], &y_all[interp_i * length]);
     }
   }
 }
@@ -158,7 +160,7 @@ for (int interp_i = start1;
 // according to scipy Cubic Spline
 CUDA_KERNEL
 void set_spline_constants(double *t_arr, double *interp_array, double *B,
-                          int ninterps, int length)
+                          int ninterps, int length, bool t_is_shared)
 {
 
   double dt;
@@ -195,9 +197,11 @@ void set_spline_constants(double *t_arr, double *interp_array, double *B,
          i += diff2)
     {
 
-      dt = t_arr[interp_i * length + i + 1] - t_arr[interp_i * length + i];
-
       int lead_ind = interp_i * length;
+      int t_lead_ind = t_is_shared ? 0 : lead_ind;
+
+      dt = t_arr[t_lead_ind + i + 1] - t_arr[t_lead_ind + i];
+
       fill_coefficients(i, length, &B[lead_ind], dt,
                         &interp_array[0 * ninterps * length + lead_ind],
                         &interp_array[1 * ninterps * length + lead_ind],
@@ -250,7 +254,7 @@ void fit_wrap(int m, int n, double *a, double *b, double *c, double *d_in)
 
 CUDA_KERNEL
 void fill_final_derivs(double *t_arr, double *interp_array,
-                      int ninterps, int length)
+                      int ninterps, int length, bool t_is_shared)
 {
     #ifdef __CUDACC__
     int start1 = blockIdx.x*blockDim.x + threadIdx.x;
@@ -270,12 +274,13 @@ void fill_final_derivs(double *t_arr, double *interp_array,
          {
 
              int lead_ind = interp_i*length;
+             int t_lead_ind = t_is_shared ? 0 : lead_ind;
             double c1 = interp_array[(1 * ninterps +  interp_i) * length + length - 2];
             double c2 = interp_array[(2 * ninterps +  interp_i) * length + length - 2];
             double c3 = interp_array[(3 * ninterps +  interp_i) * length + length - 2];
 
-            double t_begin = t_arr[interp_i * length + length - 2];
-            double t_end = t_arr[interp_i * length + length - 1];
+            double t_begin = t_arr[t_lead_ind + length - 2];
+            double t_end = t_arr[t_lead_ind + length - 1];
             double x = t_end - t_begin;
             double x2 = x * x;
             double final_c1 = c1 + 2 * c2 * x + 3 * c3 * x2;
@@ -291,7 +296,9 @@ void fill_final_derivs(double *t_arr, double *interp_array,
 
 // interpolate many y arrays (interp_array) with a singular x array (t_arr)
 // see python documentation for shape necessary for this to be done
-void interpolate_arrays(double *t_arr, double *interp_array, int ninterps, int length, double *B, double *upper_diag, double *diag, double *lower_diag)
+// if t_is_shared, t_arr has length (length) and is used for all interpolants
+// otherwise it has length (ninterps * length)
+void interpolate_arrays(double *t_arr, double *interp_array, int ninterps, int length, double *B, double *upper_diag, double *diag, double *lower_diag, bool t_is_shared)
 {
 
   // need to fill the banded matrix
@@ -303,33 +310,33 @@ void interpolate_arrays(double *t_arr, double *interp_array, int ninterps, int l
   int NUM_THREADS = 64;
   int num_blocks = std::ceil((length + NUM_THREADS - 1) / NUM_THREADS);
   dim3 gridDim(num_blocks); //, num_teuk_modes);
-  fill_B<<<gridDim, NUM_THREADS>>>(t_arr, interp_array, B, upper_diag, diag, lower_diag, ninterps, length);
+  fill_B<<<gridDim, NUM_THREADS>>>(t_arr, interp_array, B, upper_diag, diag, lower_diag, ninterps, length, t_is_shared);
   cudaDeviceSynchronize();
   gpuErrchk(cudaGetLastError());
 
   fit_wrap(length, ninterps, lower_diag, diag, upper_diag, B);
 
   set_spline_constants<<<gridDim, NUM_THREADS>>>(t_arr, interp_array, B,
-                                                 ninterps, length);
+                                                 ninterps, length, t_is_shared);
   cudaDeviceSynchronize();
   gpuErrchk(cudaGetLastError());
 
   int num_blocks_fill_derivs = std::ceil((ninterps + NUM_THREADS -1)/NUM_THREADS);
 
-  fill_final_derivs<<<num_blocks_fill_derivs, NUM_THREADS>>>(t_arr, interp_array, ninterps, length);
+  fill_final_derivs<<<num_blocks_fill_derivs, NUM_THREADS>>>(t_arr, interp_array, ninterps, length, t_is_shared);
   cudaDeviceSynchronize();
   gpuErrchk(cudaGetLastError());
 
 #else
 
-  fill_B(t_arr, interp_array, B, upper_diag, diag, lower_diag, ninterps, length);
+  fill_B(t_arr, interp_array, B, upper_diag, diag, lower_diag, ninterps, length, t_is_shared);
 
   fit_wrap(length, ninterps, lower_diag, diag, upper_diag, B);
 
   set_spline_constants(t_arr, interp_array, B,
-                                 ninterps, length);
+                                 ninterps, length, t_is_shared);
 
-  fill_final_derivs(t_arr, interp_array, ninterps, length);
+  fill_final_derivs(t_arr, interp_array, ninterps, length, t_is_shared);
 
 #endif
 }
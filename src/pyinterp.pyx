@@ -8,7 +8,7 @@ assert sizeof(int) == sizeof(np.int32_t)
 
 cdef extern from "interpolate.hh":
     ctypedef void* cmplx 'cmplx'
-    void interpolate_arrays(double *t_arr, double *interp_array, int ninterps, int length, double *B, double *upper_diag, double *diag, double *lower_diag)
+    void interpolate_arrays(double *t_arr, double *interp_array, int ninterps, int length, double *B, double *upper_diag, double *diag, double *lower_diag, bool t_is_shared)
 
     void get_waveform(cmplx *d_waveform, double *interp_array,
                   int *d_m, int *d_n, int init_len, int out_len, int num_teuk_modes, cmplx *d_Ylms,
@@ -26,7 +26,7 @@ def interpolate_arrays_wrap(*args, **kwargs):
 
     targs, kwargs = wrapper(*args, **kwargs)
 
-    t_arr, interp_array, ninterps, length, B, upper_diag, diag, lower_diag = targs
+    t_arr, interp_array, ninterps, length, B, upper_diag, diag, lower_diag, t_is_shared = targs
 
     cdef size_t t_arr_in = t_arr
     cdef size_t interp_array_in = interp_array
@@ -35,7 +35,7 @@ def interpolate_arrays_wrap(*args, **kwargs):
     cdef size_t diag_in = diag
     cdef size_t lower_diag_in = lower_diag
 
-    interpolate_arrays(<double *>t_arr_in, <double *>interp_array_in, ninterps, length, <double *>B_in, <double *>upper_diag_in, <double *>diag_in, <double *>lower_diag_in)
+    interpolate_arrays(<double *>t_arr_in, <double *>interp_array_in, ninterps, length, <double *>B_in, <double *>upper_diag_in, <double *>diag_in, <double *>lower_diag_in, t_is_shared)
 
 
 def get_waveform_wrap(*args, **kwargs):
@@ -9,6 +9,9 @@ cdef extern from "../include/Utility.hh":
     void KerrGeoCoordinateFrequenciesVectorized(double* OmegaPhi_, double* OmegaTheta_, double* OmegaR_,
                               double* a, double* p, double* e, double* x, int length);
 
+    void SchwarzschildGeoCoordinateFrequenciesVectorized(double* OmegaPhi_, double* OmegaR_,
+                              double* p, double* e, int length);
+
     void get_separatrix_vector(double* separatrix, double* a, double* e, double* x, int length);
 
     void KerrGeoConstantsOfMotionVectorized(double* E_out, double* L_out, double* Q_out, double* a, double* p, double* e, double* x, int n);
@@ -28,6 +31,17 @@ def pyKerrGeoCoordinateFrequencies(np.ndarray[ndim=1, dtype=np.float64_t] a,
     return (OmegaPhi, OmegaTheta, OmegaR)
 
 
+def pySchwarzschildGeoCoordinateFrequencies(np.ndarray[ndim=1, dtype=np.float64_t] p,
+                                             np.ndarray[ndim=1, dtype=np.float64_t] e):
+
+    cdef np.ndarray[ndim=1, dtype=np.float64_t] OmegaPhi = np.zeros(len(p), dtype=np.float64)
+    cdef np.ndarray[ndim=1, dtype=np.float64_t] OmegaR = np.zeros(len(p), dtype=np.float64)
+
+    SchwarzschildGeoCoordinateFrequenciesVectorized(&OmegaPhi[0], &OmegaR[0],
+                                &p[0], &e[0], len(p))
+    return (OmegaPhi, OmegaR)
+
+
 def pyGetSeparatrix(np.ndarray[ndim=1, dtype=np.float64_t] a,
                     np.ndarray[ndim=1, dtype=np.float64_t] e,
                     np.ndarray[ndim=1, dtype=np.float64_t] x):